@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Stage, Task, TaskRanking, OfficialRanking
+from .models import Stage, Task, TaskRanking, OfficialRanking, RankingSubmission
 
 
 @admin.register(Stage)
@@ -42,3 +42,30 @@ class OfficialRankingAdmin(admin.ModelAdmin):
 class TaskRankingAdmin(admin.ModelAdmin):
     list_display = ("user", "stage", "task", "rank", "updated_at")
     list_filter = ("stage", "user")
+
+
+@admin.register(RankingSubmission)
+class RankingSubmissionAdmin(admin.ModelAdmin):
+    list_display = ("user", "stage", "version", "is_snapshot", "score", "created_at")
+    list_filter = ("stage", "is_snapshot")
+    search_fields = ("user__username", "stage__name")
+
+    def has_add_permission(self, request):
+        """Submission history is append-only and written by the ranking form."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Submission history is append-only and written by the ranking form."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """
+        History rows cannot be deleted from their own admin pages: removing
+        one breaks reconstruction of every later version. They are still
+        removed, as a whole chain, when their user or stage is deleted.
+        """
+        match = request.resolver_match
+        own_prefix = f"{self.opts.app_label}_{self.opts.model_name}_"
+        if match and match.url_name and match.url_name.startswith(own_prefix):
+            return False
+        return super().has_delete_permission(request, obj)
@@ -21,4 +21,6 @@ class CoreConfig(AppConfig):
     name = 'core'
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         create_superuser_from_env()
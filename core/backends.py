@@ -0,0 +1,104 @@
+import threading
+import uuid
+from collections import OrderedDict
+from copy import copy
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+USER_VERSION_KEY = "core:auth-user-version:{}"
+
+
+class _UserLRU:
+    """Small thread-safe LRU of user objects, one per worker process."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            return entry
+
+    def set(self, user_id, entry) -> None:
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = _UserLRU(getattr(settings, "AUTH_USER_CACHE_SIZE", 1024))
+
+
+def _user_version(user_id) -> str:
+    """
+    Return the shared version token for a user, creating it if missing.
+
+    The token lives in the shared cache so an invalidation in one worker is
+    seen by every other worker on its next lookup.
+    """
+    key = USER_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_user_version(user_id) -> None:
+    user_cache.discard(user_id)
+    cache.set(USER_VERSION_KEY.format(user_id), uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_user(user_id) -> None:
+    """
+    Drop a cached user locally and bump its version for other workers.
+
+    The bump is repeated once the surrounding transaction commits: a worker
+    that reloads the user in between still reads the old row and would
+    otherwise cache it under the new version.
+    """
+    _bump_user_version(user_id)
+    transaction.on_commit(lambda: _bump_user_version(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that serves ``get_user`` from a per-worker LRU.
+
+    Only the user row is cached; permissions are still resolved per request,
+    so group permission edits take effect immediately. Entries are
+    invalidated by the signal handlers in ``core.signals`` whenever the user
+    is saved (password, flags, last_login), deleted, or has its groups or
+    permissions changed.
+    """
+
+    def get_user(self, user_id):
+        version = _user_version(user_id)
+        entry = user_cache.get(user_id)
+        if entry is not None and entry[0] == version:
+            # Hand out a copy so per-request attributes (e.g. _perm_cache)
+            # never leak into the shared entry.
+            return copy(entry[1])
+
+        user = super().get_user(user_id)
+        if user is None:
+            user_cache.discard(user_id)
+            return None
+        user_cache.set(user_id, (version, copy(user)))
+        return user
@@ -0,0 +1,180 @@
+"""
+Delta-encoded ranking history.
+
+Rankings are dicts of task id -> rank. JSON object keys are strings, so task
+ids are stored as strings and converted back to ints when rebuilding.
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Q
+
+from .models import RankingSubmission
+
+# A double-submitted form can race for the same version number.
+RECORD_ATTEMPTS = 3
+
+
+def _apply(ranking: dict, entry: RankingSubmission) -> dict:
+    if entry.is_snapshot:
+        ranking = {}
+    for task_id in entry.removed:
+        ranking.pop(int(task_id), None)
+    for task_id, rank in entry.changes.items():
+        ranking[int(task_id)] = rank
+    return ranking
+
+
+def latest_version(user, stage) -> int:
+    """Return the newest version number for (user, stage), or 0 if none."""
+    result = RankingSubmission.objects.filter(user=user, stage=stage).aggregate(Max("version"))
+    return result["version__max"] or 0
+
+
+def _rebuild(user, stage, version: int | None = None) -> tuple[int | None, dict, int]:
+    """
+    Rebuild a version from its nearest snapshot.
+
+    Returns (snapshot version, ranking, last version applied); the snapshot
+    version is None when no snapshot precedes ``version``.
+    """
+    entries = RankingSubmission.objects.filter(user=user, stage=stage)
+    if version is not None:
+        entries = entries.filter(version__lte=version)
+    base = entries.filter(is_snapshot=True).aggregate(Max("version"))["version__max"]
+    if base is None:
+        return None, {}, 0
+
+    ranking = {}
+    last = base
+    for entry in entries.filter(version__gte=base).order_by("version"):
+        ranking = _apply(ranking, entry)
+        last = entry.version
+    return base, ranking, last
+
+
+def reconstruct(user, stage, version: int | None = None) -> dict:
+    """
+    Rebuild the ranking as it was at ``version`` (default: latest).
+
+    Reads the nearest snapshot at or before ``version`` and the deltas
+    after it, which periodic snapshots keep to a bounded number of rows.
+    Returns {} when the pair has no history at all. Raises
+    RankingSubmission.DoesNotExist for a version that was never recorded,
+    and ValueError when the chain has no snapshot to rebuild it from.
+    """
+    if version is not None and version < 1:
+        raise RankingSubmission.DoesNotExist(f"Version {version} does not exist.")
+
+    base, ranking, last = _rebuild(user, stage, version)
+    if base is None:
+        if RankingSubmission.objects.filter(user=user, stage=stage).exists():
+            raise ValueError(
+                f"No snapshot at or before version {version or 'latest'}; the history is incomplete."
+            )
+        if version is None:
+            return {}
+    if version is not None and last != version:
+        raise RankingSubmission.DoesNotExist(f"Version {version} does not exist.")
+    return ranking
+
+
+def _append(user, stage, ranking: dict, score: float | None) -> RankingSubmission | None:
+    version = latest_version(user, stage)
+    base, previous, _ = _rebuild(user, stage) if version else (None, {}, 0)
+    if base is not None and ranking == previous:
+        return None
+
+    # Store the whole ranking for the first version, for a chain with no
+    # snapshot to build on, and every ``interval`` versions so rebuilding
+    # never replays more than that many deltas.
+    interval = getattr(settings, "RANKING_HISTORY_SNAPSHOT_INTERVAL", 20)
+    is_snapshot = base is None or version + 1 - base >= interval
+    if is_snapshot:
+        changes = {str(task_id): rank for task_id, rank in ranking.items()}
+        removed = []
+    else:
+        changes = {
+            str(task_id): rank
+            for task_id, rank in ranking.items()
+            if previous.get(task_id) != rank
+        }
+        removed = [str(task_id) for task_id in previous if task_id not in ranking]
+    return RankingSubmission.objects.create(
+        user=user,
+        stage=stage,
+        version=version + 1,
+        is_snapshot=is_snapshot,
+        changes=changes,
+        removed=removed,
+        score=score,
+    )
+
+
+def record_submission(user, stage, ranking: dict, score: float | None = None) -> RankingSubmission | None:
+    """
+    Append ``ranking`` as the next version for (user, stage).
+
+    Only the difference from the previous version is stored. Resubmitting an
+    unchanged ranking records nothing and returns None. If a concurrent
+    submission takes the same version number, the diff is recomputed against
+    it and retried.
+    """
+    for attempt in range(RECORD_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return _append(user, stage, ranking, score)
+        except IntegrityError:
+            if attempt == RECORD_ATTEMPTS - 1:
+                raise
+
+
+def compact(interval: int | None = None) -> int:
+    """
+    Fold old deltas into snapshots so no version is more than ``interval``
+    deltas away from a snapshot. Returns the number of rows rewritten.
+
+    New submissions already snapshot every ``interval`` versions; this
+    backfills history written before that, or after the interval shrinks.
+
+    Every version stays reconstructible; only the newest run of fewer than
+    ``interval`` deltas per (user, stage) is left as-is. Each chain is read
+    from its latest snapshot, and chains with too few deltas since then are
+    skipped, so repeated runs only touch new history.
+    """
+    if interval is None:
+        interval = getattr(settings, "RANKING_HISTORY_SNAPSHOT_INTERVAL", 20)
+    if interval < 1:
+        raise ValueError("Snapshot interval must be at least 1.")
+
+    # Versions are contiguous, so latest - base is the number of trailing
+    # deltas. Chains without a snapshot cannot be rebuilt and are left for
+    # the next submission to repair.
+    chains = (
+        RankingSubmission.objects.values("user_id", "stage_id")
+        .annotate(base=Max("version", filter=Q(is_snapshot=True)), latest=Max("version"))
+        .filter(base__isnull=False, latest__gte=F("base") + interval)
+        .order_by()
+    )
+    rewritten = 0
+    for chain in chains:
+        with transaction.atomic():
+            entries = RankingSubmission.objects.select_for_update().filter(
+                user_id=chain["user_id"], stage_id=chain["stage_id"], version__gte=chain["base"]
+            ).order_by("version")
+            ranking = {}
+            since_snapshot = 0
+            for entry in entries:
+                ranking = _apply(ranking, entry)
+                if entry.is_snapshot:
+                    since_snapshot = 0
+                    continue
+                since_snapshot += 1
+                if since_snapshot >= interval:
+                    entry.is_snapshot = True
+                    entry.changes = {str(task_id): rank for task_id, rank in ranking.items()}
+                    entry.removed = []
+                    entry.save(update_fields=["is_snapshot", "changes", "removed"])
+                    since_snapshot = 0
+                    rewritten += 1
+    return rewritten
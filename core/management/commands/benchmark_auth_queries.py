@@ -0,0 +1,100 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from core.backends import user_cache
+from core.models import Stage, Task
+
+AUTH_TABLES = ("django_session", "auth_user")
+
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmark-auth-queries",
+    }
+}
+
+MODES = {
+    "db": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+        "AUTHENTICATION_BACKENDS": ["django.contrib.auth.backends.ModelBackend"],
+    },
+    "cached": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.cached_db",
+        "AUTHENTICATION_BACKENDS": ["core.backends.CachedModelBackend"],
+    },
+}
+
+
+def count_queries(client: Client, url: str, requests: int) -> tuple:
+    """Return (session/auth queries, total queries) per request for a URL."""
+    client.get(url)  # warm up caches, as any earlier request would have
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(requests):
+            client.get(url)
+    auth = sum(
+        1 for query in ctx.captured_queries
+        if any(f'"{table}"' in query["sql"] for table in AUTH_TABLES)
+    )
+    return auth / requests, len(ctx.captured_queries) / requests
+
+
+class Command(BaseCommand):
+    help = "Compare per-request session/auth query counts for db and cached auth modes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20, help="Requests per page and mode.")
+
+    def handle(self, *args, **options):
+        requests = options["requests"]
+        setup_test_environment()
+        # Fixtures are written in short autocommit statements rather than one
+        # long transaction, so live requests are never blocked on the SQLite
+        # write lock; they are deleted again afterwards. Cache writes go to a
+        # throwaway local-memory cache.
+        user = get_user_model().objects.create_user(
+            f"benchmark-auth-{uuid.uuid4().hex[:12]}", password="benchmark-pass"
+        )
+        stage = Stage.objects.create(name="Benchmark stage")
+        try:
+            for order in range(1, 6):
+                Task.objects.create(stage=stage, name=f"Benchmark task {order}", order=order)
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                rows = self._run(user, stage, requests)
+        finally:
+            stage.delete()
+            user.delete()
+            teardown_test_environment()
+            user_cache.clear()
+
+        self.stdout.write(f"{'page':<14}{'mode':<8}{'auth queries':>14}{'total queries':>15}")
+        for page, mode, auth, total in rows:
+            self.stdout.write(f"{page:<14}{mode:<8}{auth:>14.2f}{total:>15.2f}")
+
+    def _run(self, user, stage, requests: int) -> list:
+        pages = {
+            "landing": reverse("core:landing"),
+            "stage_detail": reverse("core:stage_detail", args=[stage.pk]),
+        }
+        rows = []
+        for mode, overrides in MODES.items():
+            with override_settings(**overrides):
+                client = Client()
+                client.force_login(user, backend=overrides["AUTHENTICATION_BACKENDS"][0])
+                try:
+                    for page, url in pages.items():
+                        rows.append((page, mode, *count_queries(client, url, requests)))
+                finally:
+                    # Removes the benchmark session from the database.
+                    client.logout()
+        return rows
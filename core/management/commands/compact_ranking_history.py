@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.history import compact
+
+
+class Command(BaseCommand):
+    help = "Fold old ranking history deltas into snapshots. Safe to run periodically (e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.RANKING_HISTORY_SNAPSHOT_INTERVAL,
+            help="Maximum number of deltas between snapshots.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            rewritten = compact(options["interval"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(self.style.SUCCESS(f"Compacted {rewritten} submission(s) into snapshots."))
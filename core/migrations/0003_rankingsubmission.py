@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_officialranking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('is_snapshot', models.BooleanField(default=False)),
+                ('changes', models.JSONField(default=dict, help_text='Task id -> rank, for changed tasks only.')),
+                ('removed', models.JSONField(blank=True, default=list, help_text='Task ids whose rank was dropped.')),
+                ('score', models.FloatField(blank=True, help_text='Score at submission time, if an official ranking existed.', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('stage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='core.stage')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['user', 'stage', 'version'],
+                'unique_together': {('user', 'stage', 'version')},
+            },
+        ),
+    ]
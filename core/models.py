@@ -73,3 +73,32 @@ class TaskRanking(models.Model):
 
     def __str__(self) -> str:
         return f"{self.user} - {self.stage} - {self.task} -> {self.rank}"
+
+
+class RankingSubmission(models.Model):
+    """
+    Append-only history of a user's submissions for a stage.
+
+    Each row stores only what changed since the previous version of the same
+    (user, stage): ``changes`` maps task ids to their new rank and ``removed``
+    lists task ids that no longer have one. Snapshot rows hold the complete
+    ranking instead, so a version is rebuilt from the nearest snapshot at or
+    before it plus the deltas after that (see ``core.history``).
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    stage = models.ForeignKey(Stage, on_delete=models.CASCADE, related_name="submissions")
+    version = models.PositiveIntegerField()
+    is_snapshot = models.BooleanField(default=False)
+    changes = models.JSONField(default=dict, help_text="Task id -> rank, for changed tasks only.")
+    removed = models.JSONField(default=list, blank=True, help_text="Task ids whose rank was dropped.")
+    score = models.FloatField(null=True, blank=True, help_text="Score at submission time, if an official ranking existed.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "stage", "version")
+        ordering = ["user", "stage", "version"]
+
+    def __str__(self) -> str:
+        kind = "snapshot" if self.is_snapshot else "delta"
+        return f"{self.user} - {self.stage} v{self.version} ({kind})"
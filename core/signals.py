@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_user
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Password, flag and last_login changes all go through a user save."""
+    invalidate_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate users whose groups or direct permissions changed."""
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_user(instance.pk)
+        return
+
+    # Edited from the Group/Permission side, so the affected users are in
+    # pk_set, except for clear() which only reports them before the change.
+    if action == "pre_clear":
+        instance._cleared_user_ids = list(instance.user_set.values_list("pk", flat=True))
+    elif action == "post_clear":
+        user_ids = getattr(instance, "_cleared_user_ids", [])
+        for user_id in user_ids:
+            invalidate_user(user_id)
+        instance._cleared_user_ids = []
+    elif action.startswith("post_") and pk_set:
+        for user_id in pk_set:
+            invalidate_user(user_id)
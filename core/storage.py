@@ -0,0 +1,72 @@
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+# Strings and comments are matched first so the whitespace rules below never
+# touch their contents (e.g. the inline SVG data URIs in Bootstrap).
+CSS_TOKEN_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/)""", re.S)
+CSS_CHARSET_RE = re.compile(r"""^\s*@charset\s+["'][^"']*["']\s*;""", re.I)
+
+
+def minify_css(source: str) -> str:
+    """
+    Conservative CSS minifier: drops comments (except /*! licence headers)
+    and redundant whitespace, leaving selectors and values untouched.
+    """
+    parts = []
+    for index, chunk in enumerate(CSS_TOKEN_RE.split(source)):
+        if index % 2:
+            if chunk.startswith("/*") and not chunk.startswith("/*!"):
+                continue
+            parts.append(chunk)
+            continue
+        chunk = re.sub(r"\s+", " ", chunk)
+        chunk = re.sub(r"\s*([{};,])\s*", r"\1", chunk)
+        parts.append(chunk.replace(";}", "}"))
+    return "".join(parts).strip()
+
+
+def build_css_bundle(sources) -> str:
+    """Concatenate and minify CSS sources, hoisting a single @charset rule."""
+    charset = ""
+    bodies = []
+    for source in sources:
+        match = CSS_CHARSET_RE.match(source)
+        if match:
+            charset = charset or match.group(0).strip()
+            source = source[match.end():]
+        bodies.append(minify_css(source))
+    return charset + "\n".join(bodies) + "\n"
+
+
+class BundledStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    WhiteNoise manifest storage that also writes the ``STATIC_BUNDLES`` at
+    ``collectstatic`` time.
+
+    Bundles are built from the collected sources, then hashed and
+    precompressed (gzip, plus brotli when installed) with everything else.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in self.write_bundles():
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def write_bundles(self) -> list:
+        written = []
+        for name, sources in getattr(settings, "STATIC_BUNDLES", {}).items():
+            contents = []
+            for source in sources:
+                if not self.exists(source):
+                    raise ValueError(f"Static bundle {name!r} source {source!r} could not be found.")
+                with self.open(source) as handle:
+                    contents.append(handle.read().decode("utf-8"))
+            if self.exists(name):
+                self.delete(name)
+            self.save(name, ContentFile(build_css_bundle(contents).encode("utf-8")))
+            written.append(name)
+        return written
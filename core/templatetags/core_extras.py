@@ -1,4 +1,9 @@
 from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+from core.storage import BundledStaticFilesStorage
 
 register = template.Library()
 
@@ -10,3 +15,12 @@ def get_item(dictionary, key):
     return None
 
 
+@register.simple_tag
+def static_bundle(name):
+    """
+    Return the URLs to load for a ``STATIC_BUNDLES`` entry: the built bundle
+    when it is produced by collectstatic, otherwise its individual sources.
+    """
+    if isinstance(staticfiles_storage, BundledStaticFilesStorage):
+        return [static(name)]
+    return [static(source) for source in settings.STATIC_BUNDLES[name]]
@@ -1,3 +1,274 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .backends import user_cache
+from .history import compact, reconstruct, record_submission
+from .models import RankingSubmission, Stage, Task
+from .storage import build_css_bundle, minify_css
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def auth_queries(captured) -> list:
+    return [
+        query["sql"] for query in captured
+        if '"django_session"' in query["sql"] or '"auth_user"' in query["sql"]
+    ]
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user("alice", password="correct-horse-1")
+        self.stage = Stage.objects.create(name="Stage 1")
+        Task.objects.create(stage=self.stage, name="Task 1", order=1)
+        self.client.force_login(self.user)
+
+    def get_auth_queries(self, url: str) -> list:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return auth_queries(ctx.captured_queries)
+
+    def test_warm_requests_run_no_auth_queries(self):
+        for url in (reverse("core:landing"), reverse("core:stage_detail", args=[self.stage.pk])):
+            self.client.get(url)
+            self.assertEqual(self.get_auth_queries(url), [])
+
+    def test_password_change_invalidates_session(self):
+        url = reverse("core:landing")
+        self.client.get(url)
+        self.user.set_password("another-horse-2")
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_sessions_from_model_backend_still_resolve(self):
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(reverse("core:landing")).status_code, 200)
+
+    def test_user_version_is_bumped_again_on_commit(self):
+        url = reverse("core:landing")
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.is_active = False
+            self.user.save()
+        # A request racing the commit re-caches the old row under the new version.
+        User.objects.filter(pk=self.user.pk).update(is_active=True)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_group_change_reloads_user(self):
+        url = reverse("core:landing")
+        self.client.get(url)
+        group = Group.objects.create(name="editors")
+        group.user_set.add(self.user)
+        self.assertEqual(len(self.get_auth_queries(url)), 1)
+        self.assertEqual(self.get_auth_queries(url), [])
+
+
+class StaticAssetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        cls.enterClassContext(override_settings(
+            DEBUG=False,
+            STATIC_ROOT=cls.static_root,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "core.storage.BundledStaticFilesStorage"},
+            },
+        ))
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def bundle_url(self) -> str:
+        response = self.client.get(reverse("login"))
+        stylesheets = [line for line in response.content.decode().splitlines() if "stylesheet" in line]
+        self.assertEqual(len(stylesheets), 1)
+        return stylesheets[0].split('href="')[1].split('"')[0]
+
+    def test_bundle_is_hashed_and_precompressed(self):
+        url = self.bundle_url()
+        self.assertRegex(url, r"^/static/css/bundle\.[0-9a-f]{12}\.css$")
+        bundle = self.static_root / url.removeprefix("/static/")
+        for suffix in (".gz", ".br"):
+            self.assertTrue(Path(f"{bundle}{suffix}").exists())
+        self.assertIn("v5.3", bundle.read_text())
+        self.assertIn(".list-group-item.active{", bundle.read_text())
+
+    def test_hashed_files_are_served_immutable_and_compressed(self):
+        url = self.bundle_url()
+        for encoding in ("br", "gzip"):
+            response = self.client.get(url, headers={"accept-encoding": encoding})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Encoding"], encoding)
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertIn("max-age=315360000", response["Cache-Control"])
+            response.close()
+
+    def test_minify_css_keeps_strings_and_licence(self):
+        source = '@charset "UTF-8";/*! keep */ a  >  b { content: "a  ;  b" ; } /* drop */'
+        self.assertEqual(minify_css(source), '@charset "UTF-8";/*! keep */ a > b{content: "a  ;  b"}')
+        self.assertEqual(build_css_bundle([source, source]).count("@charset"), 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RankingHistoryTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user("bob", password="correct-horse-1")
+        self.stage = Stage.objects.create(name="Stage 1")
+        self.tasks = [
+            Task.objects.create(stage=self.stage, name=f"Task {order}", order=order)
+            for order in range(1, 5)
+        ]
+
+    def submit(self, *ranks):
+        self.client.force_login(self.user)
+        data = {f"rank_{task.id}": rank for task, rank in zip(self.tasks, ranks)}
+        return self.client.post(reverse("core:stage_detail", args=[self.stage.pk]), data)
+
+    def ranking(self, *ranks) -> dict:
+        return {task.id: rank for task, rank in zip(self.tasks, ranks)}
+
+    def test_submissions_store_only_changes(self):
+        self.submit(1, 2, 3, 4)
+        self.submit(2, 1, 3, 4)
+        self.submit(2, 1, 3, 4)
+
+        first, second = RankingSubmission.objects.filter(user=self.user, stage=self.stage)
+        self.assertTrue(first.is_snapshot)
+        self.assertEqual(len(first.changes), 4)
+        self.assertFalse(second.is_snapshot)
+        self.assertEqual(second.changes, {str(self.tasks[0].id): 2, str(self.tasks[1].id): 1})
+        self.assertEqual(reconstruct(self.user, self.stage, 1), self.ranking(1, 2, 3, 4))
+        self.assertEqual(reconstruct(self.user, self.stage), self.ranking(2, 1, 3, 4))
+
+    def test_removed_tasks_are_recorded(self):
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3))
+        self.assertEqual(
+            RankingSubmission.objects.get(version=2).removed, [str(self.tasks[3].id)]
+        )
+        self.assertEqual(reconstruct(self.user, self.stage), self.ranking(1, 2, 3))
+
+    def test_compaction_preserves_every_version(self):
+        orders = [(1, 2, 3, 4), (2, 1, 3, 4), (2, 3, 1, 4), (4, 3, 1, 2), (1, 3, 4, 2), (1, 2, 4, 3)]
+        for ranks in orders:
+            record_submission(self.user, self.stage, self.ranking(*ranks))
+
+        self.assertEqual(compact(interval=2), 2)
+        self.assertEqual(
+            list(RankingSubmission.objects.filter(is_snapshot=True).values_list("version", flat=True)),
+            [1, 3, 5],
+        )
+        for version, ranks in enumerate(orders, start=1):
+            self.assertEqual(reconstruct(self.user, self.stage, version), self.ranking(*ranks))
+        self.assertEqual(compact(interval=2), 0)
+
+    def test_compaction_skips_chains_already_compacted(self):
+        for ranks in [(1, 2, 3, 4), (2, 1, 3, 4), (2, 3, 1, 4)]:
+            record_submission(self.user, self.stage, self.ranking(*ranks))
+        compact(interval=2)
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        # One aggregate query finds nothing to do; no chain is reloaded.
+        with self.assertNumQueries(1):
+            self.assertEqual(compact(interval=2), 0)
+
+    def test_chain_without_snapshot_is_repaired_on_next_submission(self):
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        record_submission(self.user, self.stage, self.ranking(2, 1, 3, 4))
+        RankingSubmission.objects.filter(version=1).delete()
+
+        entry = record_submission(self.user, self.stage, self.ranking(2, 1, 4, 3))
+        self.assertTrue(entry.is_snapshot)
+        self.assertEqual(entry.version, 3)
+        record_submission(self.user, self.stage, self.ranking(1, 2, 4, 3))
+        self.assertEqual(reconstruct(self.user, self.stage), self.ranking(1, 2, 4, 3))
+
+    def test_version_conflict_is_retried(self):
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        # Simulate a concurrent request that read the version before ours was written.
+        with mock.patch("core.history.latest_version", side_effect=[0, 1]):
+            entry = record_submission(self.user, self.stage, self.ranking(2, 1, 3, 4))
+        self.assertEqual(entry.version, 2)
+        self.assertFalse(entry.is_snapshot)
+        self.assertEqual(reconstruct(self.user, self.stage), self.ranking(2, 1, 3, 4))
+
+    def test_history_cannot_be_deleted_in_admin(self):
+        admin_user = User.objects.create_superuser("root", password="correct-horse-1")
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        self.client.force_login(admin_user)
+        entry = RankingSubmission.objects.get()
+        url = reverse("admin:core_rankingsubmission_delete", args=[entry.pk])
+        self.assertEqual(self.client.post(url, {"post": "yes"}).status_code, 403)
+        self.client.post(
+            reverse("admin:core_rankingsubmission_changelist"),
+            {"action": "delete_selected", "_selected_action": [entry.pk], "post": "yes"},
+        )
+        self.assertTrue(RankingSubmission.objects.filter(pk=entry.pk).exists())
+
+    def test_deleting_stage_or_user_in_admin_removes_their_history(self):
+        admin_user = User.objects.create_superuser("root", password="correct-horse-1")
+        other_stage = Stage.objects.create(name="Stage 2")
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        record_submission(self.user, other_stage, {self.tasks[0].id: 1})
+        self.client.force_login(admin_user)
+
+        response = self.client.post(reverse("admin:core_stage_delete", args=[self.stage.pk]), {"post": "yes"})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Stage.objects.filter(pk=self.stage.pk).exists())
+        self.assertEqual(RankingSubmission.objects.filter(stage=other_stage).count(), 1)
+
+        response = self.client.post(
+            reverse("admin:auth_user_changelist"),
+            {"action": "delete_selected", "_selected_action": [self.user.pk], "post": "yes"},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(RankingSubmission.objects.exists())
+
+    @override_settings(RANKING_HISTORY_SNAPSHOT_INTERVAL=3)
+    def test_submissions_snapshot_every_interval(self):
+        orders = [(1, 2, 3, 4), (2, 1, 3, 4), (2, 3, 1, 4), (4, 3, 1, 2), (1, 3, 4, 2), (1, 2, 4, 3), (2, 1, 4, 3)]
+        for ranks in orders:
+            record_submission(self.user, self.stage, self.ranking(*ranks))
+
+        self.assertEqual(
+            list(RankingSubmission.objects.filter(is_snapshot=True).values_list("version", flat=True)),
+            [1, 4, 7],
+        )
+        for version, ranks in enumerate(orders, start=1):
+            self.assertEqual(reconstruct(self.user, self.stage, version), self.ranking(*ranks))
+        self.assertEqual(compact(interval=3), 0)
+
+    def test_reconstruct_rejects_missing_versions_and_broken_chains(self):
+        self.assertEqual(reconstruct(self.user, self.stage), {})
+        with self.assertRaises(RankingSubmission.DoesNotExist):
+            reconstruct(self.user, self.stage, 1)
+
+        record_submission(self.user, self.stage, self.ranking(1, 2, 3, 4))
+        record_submission(self.user, self.stage, self.ranking(2, 1, 3, 4))
+        for version in (0, 3):
+            with self.assertRaises(RankingSubmission.DoesNotExist):
+                reconstruct(self.user, self.stage, version)
+
+        RankingSubmission.objects.filter(version=1).delete()
+        with self.assertRaises(ValueError):
+            reconstruct(self.user, self.stage, 2)
+        with self.assertRaises(ValueError):
+            reconstruct(self.user, self.stage)
@@ -1,11 +1,13 @@
 from django.contrib.auth import login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views import View
 
+from .history import record_submission
 from .models import Stage, Task, TaskRanking, OfficialRanking
 
 
@@ -209,16 +211,32 @@ class StageDetailView(LoginRequiredMixin, View):
             }
             return render(request, "core/stage_detail.html", context)
 
-        # Save rankings: upsert for each task
-        for task in tasks:
-            rank_val = submitted_ranks.get(task.id)
-            if rank_val is None:
-                continue
-            TaskRanking.objects.update_or_create(
-                user=request.user,
-                stage=stage,
-                task=task,
-                defaults={"rank": rank_val},
-            )
+        # Save rankings: upsert for each task, and append the resulting
+        # ranking to the submission history
+        existing_rankings = {
+            ranking.task_id: ranking.rank
+            for ranking in TaskRanking.objects.filter(user=request.user, stage=stage)
+        }
+        official_rankings = {
+            ranking.task_id: ranking.rank
+            for ranking in OfficialRanking.objects.filter(stage=stage)
+        }
+        new_rankings = {**existing_rankings, **submitted_ranks}
+        score = None
+        if official_rankings:
+            score = self._calculate_score(new_rankings, official_rankings, max_rank)["score"]
+
+        with transaction.atomic():
+            for task in tasks:
+                rank_val = submitted_ranks.get(task.id)
+                if rank_val is None:
+                    continue
+                TaskRanking.objects.update_or_create(
+                    user=request.user,
+                    stage=stage,
+                    task=task,
+                    defaults={"rank": rank_val},
+                )
+            record_submission(request.user, stage, new_rankings, score=score)
 
         return redirect(reverse("core:stage_detail", args=[stage.id]))
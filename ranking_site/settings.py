@@ -82,10 +82,51 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Take the write lock when a transaction starts so concurrent writers
+        # (e.g. a double-submitted ranking form) queue up instead of failing
+        # with "database is locked" when upgrading a read lock.
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
 
+# Cache, sessions and authentication
+# Sessions are read from the cache and only fall back to the database on a
+# miss, and users are served from a per-worker LRU (see core.backends), so
+# an authenticated request normally runs no session or auth_user queries.
+# The file-based cache is shared by all workers on the host, which keeps
+# logouts and user invalidations visible across processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', str(BASE_DIR / '.django_cache')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# ModelBackend stays listed so sessions created before the cached backend
+# was introduced (which record its path) keep resolving; new logins use the
+# cached backend since it authenticates first.
+AUTHENTICATION_BACKENDS = [
+    'core.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+AUTH_USER_CACHE_SIZE = int(os.environ.get('AUTH_USER_CACHE_SIZE', '1024'))
+
+
+# Ranking history: every Nth version of a (user, stage) chain is stored as a
+# full snapshot, bounding how many rows a reconstruction reads.
+# compact_ranking_history backfills snapshots for older history.
+RANKING_HISTORY_SNAPSHOT_INTERVAL = int(os.environ.get('RANKING_HISTORY_SNAPSHOT_INTERVAL', '20'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -124,6 +165,38 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+# Front-end assets are vendored under static/vendor. With static bundling on,
+# collectstatic concatenates and minifies each bundle, then stores every file
+# under a content-hashed name with gzip and brotli variants, which WhiteNoise
+# serves with far-future immutable cache headers. With it off the bundle
+# sources are served individually (see the static_bundle template tag).
+# collectstatic and the running app must agree on this setting, so it has
+# its own variable instead of following DJANGO_DEBUG (the Dockerfile sets it
+# for both the image build and runtime).
+STATIC_BUNDLING = os.environ.get(
+    'DJANGO_STATIC_BUNDLING', str(not DEBUG)
+).lower() in ('true', '1', 'yes')
+
+STATIC_BUNDLES = {
+    'css/bundle.css': [
+        'vendor/bootstrap/css/bootstrap.min.css',
+        'css/styles.css',
+    ],
+}
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'core.storage.BundledStaticFilesStorage'
+            if STATIC_BUNDLING
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 # CSRF trusted origins for Azure/HTTPS
 CSRF_TRUSTED_ORIGINS = os.environ.get(
     'CSRF_TRUSTED_ORIGINS',